@@ -66,6 +66,55 @@ FILE_TYPE_MAPPINGS = {
     }
 }
 
+# Extensions listed under more than one category, and the category they go to
+EXTENSION_CONFLICTS = {
+    '.md': 'Documents',       # Markdown, not Mega Drive ROMs
+    '.html': 'Documents',
+    '.xml': 'Documents',
+    '.iso': 'Archives',       # Disk images, not Games
+    '.img': 'Archives',
+    '.key': 'Presentations',  # Keynote, not Code (private keys)
+}
+
+def build_extension_map(mappings, conflicts):
+    """
+    Invert category -> extensions mappings into an extension -> category dict.
+    Every extension listed under more than one category must be resolved in conflicts,
+    so the result never depends on the order of the categories.
+    """
+    ext_to_category = {}
+    unresolved = []
+    for category, extensions in mappings.items():
+        for ext in extensions:
+            if ext in ext_to_category and ext not in conflicts:
+                unresolved.append(f"{ext} ({ext_to_category[ext]}, {category})")
+            ext_to_category.setdefault(ext, category)
+    
+    if unresolved:
+        raise ValueError(
+            "Extensions in more than one category, add them to EXTENSION_CONFLICTS: "
+            + ", ".join(unresolved)
+        )
+    
+    ext_to_category.update(conflicts)
+    return ext_to_category
+
+# Freeze the mappings so they can't drift from the lookup built from them
+FILE_TYPE_MAPPINGS = {
+    category: frozenset(extensions)
+    for category, extensions in FILE_TYPE_MAPPINGS.items()
+}
+
+# Inverted lookup: extension -> category
+EXT_TO_CATEGORY = build_extension_map(FILE_TYPE_MAPPINGS, EXTENSION_CONFLICTS)
+
+# Multi-part extensions that a single-suffix lookup can't see
+MULTI_EXT = {
+    '.tar.gz': 'Archives',
+    '.tar.bz2': 'Archives',
+    '.tar.xz': 'Archives',
+}
+
 # System files and directories to skip
 SKIP_FILES = {
     '.ds_store', '.localized', 'desktop.ini', 'thumbs.db', '.directory',
@@ -73,27 +122,20 @@ SKIP_FILES = {
     '.trashes', '.fseventsd', '.temporaryitems'
 }
 
-def get_file_category(file_path):
-    """Determine which category a file belongs to based on its extension."""
-    extension = file_path.suffix.lower()
-    
+def get_file_category(file_name):
+    """Determine which category a file belongs to based on its (lowercase) name's extension."""
     # Handle special cases like .tar.gz
-    if file_path.name.lower().endswith(('.tar.gz', '.tar.bz2', '.tar.xz')):
-        return 'Archives'
-    
-    for category, extensions in FILE_TYPE_MAPPINGS.items():
-        if extension in extensions:
+    for multi_ext, category in MULTI_EXT.items():
+        if file_name.endswith(multi_ext):
             return category
     
-    return None
+    return EXT_TO_CATEGORY.get(os.path.splitext(file_name)[1])
 
-def should_skip_file(file_path):
-    """Check if a file should be skipped (system files, etc.)."""
-    file_name = file_path.name.lower()
+def should_skip_file(file_name):
+    """Check if a file should be skipped (system files, etc.) by its lowercase name."""
     return (
         file_name in SKIP_FILES or
-        file_name.startswith('.') and len(file_name) > 1 or
-        file_path.is_dir()
+        file_name.startswith('.') and len(file_name) > 1
     )
 
 def create_category_folders(base_path, categories):
@@ -111,8 +153,45 @@ def create_category_folders(base_path, categories):
                 return False
     return True
 
+def link_move(source, destination):
+    """
+    Move a file by hard-linking it to destination and unlinking the source.
+    os.link fails atomically if the name is taken, so naming conflicts get a number
+    suffix without a separate exists() check. Returns the final destination, or None
+    if hard links can't be used here (other filesystem, FAT, etc.).
+    """
+    name_without_ext = destination.stem
+    extension = destination.suffix
+    counter = 1
+    while True:
+        try:
+            os.link(source, destination, follow_symlinks=False)
+            break
+        except FileExistsError:
+            new_name = f"{name_without_ext}_{counter}{extension}"
+            destination = destination.parent / new_name
+            counter += 1
+        except (OSError, NotImplementedError):
+            return None
+    
+    try:
+        os.unlink(source)
+    except OSError:
+        os.unlink(destination)
+        raise
+    return destination
+
 def move_file_safely(source, destination):
     """Move a file safely, handling naming conflicts."""
+    try:
+        final_destination = link_move(source, destination)
+    except OSError as e:
+        print(f"❌ Error moving {source.name}: {e}")
+        return False, None
+    if final_destination:
+        return True, final_destination
+    
+    # Hard links not available, check names and move
     if destination.exists():
         # If destination exists, add a number suffix
         counter = 1
@@ -149,17 +228,22 @@ def organize_folder(folder_path):
     files_to_organize = defaultdict(list)
     skipped_files = []
     
-    for item in folder_path.iterdir():
-        if item.is_file():
-            if should_skip_file(item):
-                skipped_files.append(item.name)
+    # os.scandir gets the file type from the directory listing, without a stat per entry
+    with os.scandir(folder_path) as entries:
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            
+            name_lower = entry.name.lower()
+            if should_skip_file(name_lower):
+                skipped_files.append(entry.name)
                 continue
             
-            category = get_file_category(item)
+            category = get_file_category(name_lower)
             if category:
-                files_to_organize[category].append(item)
+                files_to_organize[category].append(Path(entry.path))
             else:
-                print(f"⚠️  Unknown file type: {item.name}")
+                print(f"⚠️  Unknown file type: {entry.name}")
     
     if not files_to_organize:
         print("ℹ️  No files found to organize.")
@@ -2,56 +2,98 @@
 """
 Photo Organizer Script
 Sorts photos into YEAR/MONTH/DAY folder structure based on EXIF date or file modification date.
-Supports RAF and JPG formats.
+Supports RAF, JPG and HEIC formats (HEIC EXIF via pillow-heif if installed, else exifread).
 """
 
 import os
 import shutil
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from PIL import Image
-from PIL.ExifTags import TAGS
 import exifread
 
-def get_exif_date(file_path):
+try:
+    # Optional: lets PIL open HEIC files. Registered once here, not per photo.
+    from pillow_heif import register_heif_opener
+    register_heif_opener()
+except ImportError:
+    pass
+
+# EXIF tag ids
+EXIF_IFD_ID = 0x8769
+DATETIME_ORIGINAL_ID = 0x9003
+DATETIME_ID = 0x0132
+
+# Raw formats PIL can't read EXIF from; these go straight to exifread
+RAW_EXTENSIONS = {'.raf', '.nef', '.cr2', '.arw', '.dng', '.orf', '.rw2'}
+
+# Below this many photos the process pool startup costs more than it saves
+PARALLEL_THRESHOLD = 64
+
+def parse_exif_datetime(value):
+    """
+    Parse an EXIF "YYYY:MM:DD HH:MM:SS" string into a datetime object.
+    Slicing the fixed-width fields is much faster than datetime.strptime.
     """
-    Extract date from EXIF data. Tries multiple methods for robustness.
+    return datetime(int(value[0:4]), int(value[5:7]), int(value[8:10]),
+                    int(value[11:13]), int(value[14:16]), int(value[17:19]))
+
+def get_pil_exif_date(file_path):
+    """
+    Extract date from EXIF data using PIL (works well for JPG).
     Returns datetime object or None if no date found.
     """
     try:
-        # Method 1: Using PIL (works well for JPG)
+        # Image.open only reads the header; nothing here may touch pixel data
+        # (img.load(), img.size), or the whole image gets decoded
         with Image.open(file_path) as img:
-            exif_data = img._getexif()
-            if exif_data:
-                for tag_id, value in exif_data.items():
-                    tag = TAGS.get(tag_id, tag_id)
-                    if tag == "DateTimeOriginal":
-                        return datetime.strptime(value, "%Y:%m:%d %H:%M:%S")
-                    elif tag == "DateTime":
-                        return datetime.strptime(value, "%Y:%m:%d %H:%M:%S")
+            exif = img.getexif()
+            # DateTimeOriginal lives in the Exif sub-IFD, DateTime in the main one
+            value = exif.get_ifd(EXIF_IFD_ID).get(DATETIME_ORIGINAL_ID) or exif.get(DATETIME_ID)
+            if value:
+                return parse_exif_datetime(value)
     except Exception:
         pass
     
+    return None
+
+def get_exifread_date(file_path):
+    """
+    Extract date from EXIF data using exifread (better for RAF and other formats).
+    Returns datetime object or None if no date found.
+    """
     try:
-        # Method 2: Using exifread (better for RAF and other formats)
         with open(file_path, 'rb') as f:
-            tags = exifread.process_file(f, stop_tag='DateTimeOriginal')
+            # details=False skips maker notes, which are most of the parsing work on raw files
+            tags = exifread.process_file(f, stop_tag='DateTimeOriginal', details=False)
             
             # Try DateTimeOriginal first (when photo was taken)
             if 'EXIF DateTimeOriginal' in tags:
                 date_str = str(tags['EXIF DateTimeOriginal'])
-                return datetime.strptime(date_str, "%Y:%m:%d %H:%M:%S")
+                return parse_exif_datetime(date_str)
             
             # Fallback to DateTime
             elif 'Image DateTime' in tags:
                 date_str = str(tags['Image DateTime'])
-                return datetime.strptime(date_str, "%Y:%m:%d %H:%M:%S")
+                return parse_exif_datetime(date_str)
     except Exception:
         pass
     
     return None
 
+def get_exif_date(file_path):
+    """
+    Extract date from EXIF data. Picks the reader by file extension:
+    raw formats go straight to exifread, everything else tries PIL first.
+    Returns datetime object or None if no date found.
+    """
+    if Path(file_path).suffix.lower() in RAW_EXTENSIONS:
+        return get_exifread_date(file_path)
+    
+    return get_pil_exif_date(file_path) or get_exifread_date(file_path)
+
 def get_file_date(file_path):
     """
     Get date from file system (modification date).
@@ -74,24 +116,99 @@ def get_photo_date(file_path):
     file_date = get_file_date(file_path)
     return file_date, "File Modified"
 
-def create_date_path(base_dir, date_obj):
+def date_photo(file_path):
+    """
+    Worker for the date extraction phase.
+    Returns (file_path, date, source); on failure date is None and source holds the error.
+    """
+    try:
+        photo_date, date_source = get_photo_date(file_path)
+        return file_path, photo_date, date_source
+    except Exception as e:
+        return file_path, None, str(e)
+
+def date_photos(files):
+    """
+    Get dates for all photo files, using a process pool for larger batches.
+    Returns a list of (file_path, date, source) tuples in the same order as files.
+    """
+    if len(files) > PARALLEL_THRESHOLD:
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            return list(executor.map(date_photo, files, chunksize=32))
+    return [date_photo(file_path) for file_path in files]
+
+def create_date_path(base_dir, date_obj, date_folders=None):
     """
     Create directory path in YEAR/MONTH/DAY format.
+    If date_folders (a dict keyed on (year, month, day)) is given, folders already
+    in it are returned straight away without building the path or creating it again.
     """
-    year = date_obj.strftime("%Y")
-    month = date_obj.strftime("%m")
-    day = date_obj.strftime("%d")
+    key = (date_obj.year, date_obj.month, date_obj.day)
+    if date_folders is not None and key in date_folders:
+        return date_folders[key]
     
-    date_path = Path(base_dir) / year / month / day
+    # f-strings avoid the locale handling of strftime
+    date_path = Path(base_dir) / f"{key[0]:04d}" / f"{key[1]:02d}" / f"{key[2]:02d}"
     date_path.mkdir(parents=True, exist_ok=True)
+    if date_folders is not None:
+        date_folders[key] = date_path
     
     return date_path
 
+def link_move(source, destination):
+    """
+    Move a file by hard-linking it to destination and unlinking the source.
+    os.link fails atomically if the name is taken, so naming conflicts get a number
+    suffix without a separate exists() check. Returns the final destination, or None
+    if hard links can't be used here (other filesystem, FAT, etc.).
+    """
+    original_name = destination.stem
+    extension = destination.suffix
+    counter = 1
+    while True:
+        try:
+            os.link(source, destination, follow_symlinks=False)
+            break
+        except FileExistsError:
+            new_name = f"{original_name}_{counter}{extension}"
+            destination = destination.parent / new_name
+            counter += 1
+        except (OSError, NotImplementedError):
+            return None
+    
+    try:
+        os.unlink(source)
+    except OSError:
+        os.unlink(destination)
+        raise
+    return destination
+
+def iter_files(root):
+    """
+    Recursively yield os.DirEntry objects for all files under root.
+    Uses os.scandir so file type checks come from the directory read itself.
+    """
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            it = os.scandir(directory)
+        except OSError as e:
+            # Skip unreadable directories, as Path.rglob did
+            print(f"Skipping unreadable directory {directory}: {e}")
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    yield entry
+
 def is_supported_format(file_path):
     """
-    Check if file is a supported image format (RAF or JPG).
+    Check if file is a supported image format (RAF, JPG or HEIC).
     """
-    supported_extensions = {'.jpg', '.jpeg', '.raf', '.JPG', '.JPEG', '.RAF'}
+    supported_extensions = {'.jpg', '.jpeg', '.raf', '.heic', '.JPG', '.JPEG', '.RAF', '.HEIC'}
     return Path(file_path).suffix in supported_extensions
 
 def organize_photos(source_dir, destination_dir, copy_files=False, dry_run=False):
@@ -130,29 +247,48 @@ def organize_photos(source_dir, destination_dir, copy_files=False, dry_run=False
     print(f"Operation: {'Copy' if copy_files else 'Move'}")
     print("-" * 50)
     
-    # Process all files in source directory (including subdirectories)
-    for file_path in source_path.rglob('*'):
-        if file_path.is_file():
-            stats['total_files'] += 1
+    # Phase 1: collect supported files in source directory (including subdirectories)
+    photo_files = []
+    for entry in iter_files(source_path):
+        stats['total_files'] += 1
+        
+        # Check if it's a supported image format
+        if is_supported_format(entry.name):
+            photo_files.append(Path(entry.path))
+    
+    # Phase 2: extract dates (parallel, read-only)
+    dated_photos = date_photos(photo_files)
+    
+    # Phase 3: create folders and move/copy files serially to avoid naming races
+    date_folders = {}
+    same_device = os.stat(source_path).st_dev == os.stat(dest_path).st_dev
+    for file_path, photo_date, date_source in dated_photos:
+        if photo_date is None:
+            print(f"Error processing {file_path.name}: {date_source}")
+            stats['errors'] += 1
+            continue
+        
+        try:
+            # Update statistics
+            if date_source == "EXIF":
+                stats['exif_used'] += 1
+            else:
+                stats['file_date_used'] += 1
             
-            # Check if it's a supported image format
-            if not is_supported_format(file_path):
-                continue
+            # Create destination path
+            date_folder = create_date_path(dest_path, photo_date, date_folders)
+            dest_file_path = date_folder / file_path.name
             
-            try:
-                # Get the photo date
-                photo_date, date_source = get_photo_date(file_path)
-                
-                # Update statistics
-                if date_source == "EXIF":
-                    stats['exif_used'] += 1
-                else:
-                    stats['file_date_used'] += 1
-                
-                # Create destination path
-                date_folder = create_date_path(dest_path, photo_date)
-                dest_file_path = date_folder / file_path.name
-                
+            # Show what we're doing
+            operation = "COPY" if copy_files else "MOVE"
+            print(f"[{operation}] {file_path.name} -> {date_folder.relative_to(dest_path)} ({date_source})")
+            
+            # On the same filesystem, move with a hard link, which also resolves name conflicts
+            moved = False
+            if not dry_run and not copy_files and same_device:
+                moved = link_move(file_path, dest_file_path) is not None
+            
+            if not moved:
                 # Handle file name conflicts
                 counter = 1
                 original_name = file_path.stem
@@ -162,22 +298,18 @@ def organize_photos(source_dir, destination_dir, copy_files=False, dry_run=False
                     dest_file_path = date_folder / new_name
                     counter += 1
                 
-                # Show what we're doing
-                operation = "COPY" if copy_files else "MOVE"
-                print(f"[{operation}] {file_path.name} -> {date_folder.relative_to(dest_path)} ({date_source})")
-                
                 # Perform the operation (unless dry run)
                 if not dry_run:
                     if copy_files:
                         shutil.copy2(file_path, dest_file_path)
                     else:
                         shutil.move(str(file_path), str(dest_file_path))
-                
-                stats['processed'] += 1
-                
-            except Exception as e:
-                print(f"Error processing {file_path.name}: {e}")
-                stats['errors'] += 1
+            
+            stats['processed'] += 1
+            
+        except Exception as e:
+            print(f"Error processing {file_path.name}: {e}")
+            stats['errors'] += 1
     
     # Print statistics
     print("-" * 50)
@@ -4,60 +4,153 @@ String replacer script that replaces all occurrences of a string in:
 - File contents (for text files)
 - File names
 - Directory names
+
+Several strings can be replaced at once with --pairs, a tab-separated file of
+search/replace pairs, which are all applied in a single pass.
 """
 
 import os
+import re
 import sys
+import mmap
 import argparse
 from pathlib import Path
 import mimetypes
+import functools
 import traceback
 
 
-def is_text_file(file_path):
-    """Check if a file is likely a text file based on its mimetype."""
-    mime_type, _ = mimetypes.guess_type(file_path)
+# Files smaller than this are read directly; mmap setup isn't worth it
+MMAP_THRESHOLD = 64 * 1024
+
+
+# Non text/* mimetypes that should still be treated as text
+TEXT_MIME_TYPES = {
+    'application/json',
+    'application/xml',
+    'application/javascript',
+    'application/x-yaml',
+    'application/x-sh',
+    'application/x-python-code'
+}
+
+
+@functools.lru_cache(maxsize=512)
+def is_text_extension(ext):
+    """
+    Check if a file extension maps to a text mimetype.
+    Returns None if the mimetype is unknown. Cached, as most trees share few extensions.
+    """
+    mime_type, _ = mimetypes.guess_type('x' + ext)
     if mime_type:
-        return mime_type.startswith('text/') or mime_type in [
-            'application/json',
-            'application/xml',
-            'application/javascript',
-            'application/x-yaml',
-            'application/x-sh',
-            'application/x-python-code'
-        ]
-    
-    # Try to read a small portion to detect if it's text
+        return mime_type.startswith('text/') or mime_type in TEXT_MIME_TYPES
+    return None
+
+
+def is_text_mime(file_path):
+    """
+    Check if a file is a text file based on its mimetype.
+    Returns None if the mimetype is unknown.
+    """
+    return is_text_extension(os.path.splitext(file_path)[1].lower())
+
+
+def is_text_chunk(chunk):
+    """Check if the first bytes of a file look like text."""
+    # Check for null bytes (binary indicator)
+    if b'\x00' in chunk:
+        return False
+    # Try to decode as UTF-8
     try:
-        with open(file_path, 'rb') as f:
-            chunk = f.read(512)
-            # Check for null bytes (binary indicator)
-            if b'\x00' in chunk:
+        chunk.decode('utf-8')
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+def find_bytes(data, search_bytes):
+    """Check if data contains search_bytes (a bytes string, or a compiled bytes pattern)."""
+    if isinstance(search_bytes, bytes):
+        return data.find(search_bytes) >= 0
+    return search_bytes.search(data) is not None
+
+
+def contains_bytes(file_path, search_bytes, sniff):
+    """
+    Check if a file contains search_bytes without decoding it (see find_bytes).
+    Large files are memory-mapped. If sniff is True, binary-looking files
+    (see is_text_chunk) are reported as not containing the string.
+    """
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return False
+        if size < MMAP_THRESHOLD:
+            data = f.read()
+            if sniff and not is_text_chunk(data[:512]):
                 return False
-            # Try to decode as UTF-8
-            try:
-                chunk.decode('utf-8')
-                return True
-            except UnicodeDecodeError:
+            return find_bytes(data, search_bytes)
+        
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if sniff and not is_text_chunk(mm[:512]):
                 return False
-    except:
-        return False
+            return find_bytes(mm, search_bytes)
+
 
+def load_pairs(pairs_file):
+    """Read search/replace pairs from a tab-separated file, one pair per line."""
+    pairs = {}
+    with open(pairs_file, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.rstrip('\r\n')
+            if not line:
+                continue
+            parts = line.split('\t')
+            if len(parts) != 2 or not parts[0]:
+                raise ValueError(f"{pairs_file}:{line_number}: expected 'search<TAB>replace'")
+            pairs[parts[0]] = parts[1]
+    return pairs
 
-def replace_in_file_content(file_path, search_str, replace_str):
-    """Replace string in file content if it's a text file."""
-    if not is_text_file(file_path):
+
+def compile_pairs(pairs):
+    """
+    Build the replacement function and byte pre-check for a dict of search -> replace pairs.
+    A single pair uses str.replace and a bytes search string. Several pairs use one
+    compiled alternation (longest first, so overlapping tokens prefer the longer one),
+    so the content is rewritten once instead of once per pair.
+    Returns (replace, search_bytes).
+    """
+    if len(pairs) == 1:
+        (search_str, replace_str), = pairs.items()
+        return (lambda text: text.replace(search_str, replace_str)), search_str.encode('utf-8')
+    
+    keys = sorted(pairs, key=len, reverse=True)
+    pattern = re.compile('|'.join(re.escape(k) for k in keys))
+    byte_pattern = re.compile(b'|'.join(re.escape(k.encode('utf-8')) for k in keys))
+    return (lambda text: pattern.sub(lambda m: pairs[m.group(0)], text)), byte_pattern
+
+
+def replace_in_file_content(file_path, replace, search_bytes):
+    """
+    Replace strings in file content if it's a text file.
+    replace and search_bytes come from compile_pairs.
+    """
+    text_mime = is_text_mime(file_path)
+    if text_mime is False:
         return False
     
     try:
+        # Skip the decode entirely when the raw bytes don't match
+        if not contains_bytes(file_path, search_bytes, sniff=text_mime is None):
+            return False
+        
         # Read file content
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
         # Check if replacement is needed
-        if search_str in content:
-            new_content = content.replace(search_str, replace_str)
-            
+        new_content = replace(content)
+        if new_content != content:
             # Write back the modified content
             with open(file_path, 'w', encoding='utf-8') as f:
                 f.write(new_content)
@@ -70,70 +163,98 @@ def replace_in_file_content(file_path, search_str, replace_str):
     return False
 
 
-def get_new_name(old_name, search_str, replace_str):
-    """Get the new name after string replacement."""
-    if search_str in old_name:
-        return old_name.replace(search_str, replace_str)
+def get_new_name(old_name, replace):
+    """Get the new name after string replacement, or None if it doesn't change."""
+    new_name = replace(old_name)
+    if new_name != old_name:
+        return new_name
     return None
 
 
-def process_directory(root_path, search_str, replace_str):
-    """Process all files and directories recursively."""
+def iter_tree(root):
+    """
+    Yield (path, name, is_dir) for everything under root, children before their parent,
+    so entries can be renamed while iterating without invalidating paths still to come.
+    Uses os.scandir so file types come from the directory read itself.
+    Only regular files and directories are yielded; the root directory itself is not.
+    """
+    stack = [(root, None, False)]
+    while stack:
+        directory, name, expanded = stack.pop()
+        if expanded:
+            if directory != root:
+                yield directory, name, True
+            continue
+        
+        # Unreadable directories are skipped (and not renamed), as os.walk did
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError as e:
+            print(f"  Skipping unreadable directory {directory}: {e}")
+            continue
+        
+        # Revisit this directory once all of its children have been yielded
+        stack.append((directory, name, True))
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                stack.append((entry.path, entry.name, False))
+            elif entry.is_file():
+                yield entry.path, entry.name, False
+            # Anything else (symlinks to directories, FIFOs, sockets, devices,
+            # broken symlinks) is left alone, as os.walk did
+
+
+def process_directory(root_path, pairs):
+    """
+    Process all files and directories recursively, in a single bottom-up pass.
+    pairs is a dict of search -> replace strings.
+    """
     root_path = Path(root_path).resolve()
     
     if not root_path.exists():
         print(f"Error: Path '{root_path}' does not exist.")
         return
     
-    # Collect all paths first to avoid issues with renaming during traversal
-    all_paths = []
-    
     # If root_path is a file, just process it
     if root_path.is_file():
-        all_paths.append(root_path)
+        entries = [(str(root_path), root_path.name, False)]
     else:
-        # Collect all files and directories
-        for dirpath, dirnames, filenames in os.walk(root_path, topdown=False):
-            dirpath = Path(dirpath)
-            
-            # Add files
-            for filename in filenames:
-                all_paths.append(dirpath / filename)
-            
-            # Add directories (excluding root)
-            if dirpath != root_path:
-                all_paths.append(dirpath)
+        entries = iter_tree(str(root_path))
+    
+    # Build the replacement and raw byte pre-check once for every file
+    replace, search_bytes = compile_pairs(pairs)
     
     # Statistics
     files_content_modified = 0
     files_renamed = 0
     dirs_renamed = 0
     
-    # Process all collected paths
-    for path in all_paths:
-        if path.is_file():
+    # Process entries as they are found, deepest first
+    for path, name, is_dir in entries:
+        if not is_dir:
             # Replace in file content
-            if replace_in_file_content(path, search_str, replace_str):
+            if replace_in_file_content(path, replace, search_bytes):
                 files_content_modified += 1
             
             # Check if file needs renaming
-            new_name = get_new_name(path.name, search_str, replace_str)
-            if new_name and new_name != path.name:
-                new_path = path.parent / new_name
+            new_name = get_new_name(name, replace)
+            if new_name:
+                new_path = os.path.join(os.path.dirname(path), new_name)
                 try:
-                    path.rename(new_path)
+                    os.rename(path, new_path)
                     print(f"  Renamed file: {path} -> {new_path}")
                     files_renamed += 1
                 except Exception as e:
                     print(f"  Error renaming file {path}: {e}")
         
-        elif path.is_dir():
+        else:
             # Check if directory needs renaming
-            new_name = get_new_name(path.name, search_str, replace_str)
-            if new_name and new_name != path.name:
-                new_path = path.parent / new_name
+            new_name = get_new_name(name, replace)
+            if new_name:
+                new_path = os.path.join(os.path.dirname(path), new_name)
                 try:
-                    path.rename(new_path)
+                    os.rename(path, new_path)
                     print(f"  Renamed directory: {path} -> {new_path}")
                     dirs_renamed += 1
                 except Exception as e:
@@ -141,8 +262,8 @@ def process_directory(root_path, search_str, replace_str):
     
     # Check if root directory itself needs renaming (only if it's a directory)
     if root_path.is_dir():
-        new_name = get_new_name(root_path.name, search_str, replace_str)
-        if new_name and new_name != root_path.name:
+        new_name = get_new_name(root_path.name, replace)
+        if new_name:
             new_path = root_path.parent / new_name
             try:
                 root_path.rename(new_path)
@@ -163,19 +284,35 @@ def main():
         description="Replace all occurrences of a string in file contents, file names, and directory names."
     )
     parser.add_argument("path", help="Path to file or directory to process")
-    parser.add_argument("search_string", help="String to search for")
-    parser.add_argument("replace_string", help="String to replace with")
+    parser.add_argument("search_string", nargs="?", help="String to search for")
+    parser.add_argument("replace_string", nargs="?", help="String to replace with")
+    parser.add_argument("--pairs", metavar="FILE",
+                       help="Tab-separated file of search/replace pairs, applied in a single pass")
     parser.add_argument("-y", "--yes", action="store_true", 
                        help="Skip confirmation prompt")
     
     args = parser.parse_args()
     
+    pairs = {}
+    if args.pairs:
+        try:
+            pairs = load_pairs(args.pairs)
+        except (OSError, ValueError) as e:
+            parser.error(f"could not read pairs file: {e}")
+    if args.search_string is not None:
+        if args.replace_string is None:
+            parser.error("replace_string is required with search_string")
+        pairs[args.search_string] = args.replace_string
+    if not pairs:
+        parser.error("give search_string and replace_string, or --pairs")
+    
     # Show what will be done
     print(f"String Replacer")
     print(f"===============")
     print(f"Path: {args.path}")
-    print(f"Search for: '{args.search_string}'")
-    print(f"Replace with: '{args.replace_string}'")
+    for search_str, replace_str in pairs.items():
+        print(f"Search for: '{search_str}'")
+        print(f"Replace with: '{replace_str}'")
     print()
     
     # Confirmation
@@ -187,7 +324,7 @@ def main():
     
     print("\nProcessing...")
     try:
-        process_directory(args.path, args.search_string, args.replace_string)
+        process_directory(args.path, pairs)
         print("\nOperation completed successfully!")
     except Exception as e:
         print(f"\nError during processing: {e}")
@@ -4,75 +4,112 @@ import datetime
 import os
 import sys
 
+# "YYYYMMDDTHHMMSS" via str.format, which is faster than strftime
+ICS_DATETIME_FORMAT = "{:04d}{:02d}{:02d}T{:02d}{:02d}{:02d}".format
+
+# One VEVENT, filled in with str.format
+EVENT_TEMPLATE = (
+    "BEGIN:VEVENT\n"
+    "UID:{uid}\n"
+    "DTSTAMP:{dtstamp}\n"
+    "DTSTART:{dtstart}\n"
+    "DTEND:{dtend}\n"
+    "SUMMARY:{summary}\n"
+    "END:VEVENT\n"
+)
+
+# Number of formatted events joined into a single write
+EVENTS_PER_WRITE = 10000
+
+def format_ics_datetime(dt):
+    return ICS_DATETIME_FORMAT(dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second)
+
 def generate_ics(csv_file, ics_file):
-    # The lines we’ll write to the final .ics:
-    ics_lines = [
-        "BEGIN:VCALENDAR",
-        "VERSION:2.0",
-        "PRODID:-//Chillaid//Bulk ICS Generator//EN",
-    ]
-
-    # Read the CSV with error handling
+    # DTSTAMP is when the calendar was generated, so one value serves every event.
+    # RFC 5545 requires it in UTC.
+    dtstamp = format_ics_datetime(datetime.datetime.now(datetime.timezone.utc)) + "Z"
+
+    # Stream events in batches (large buffer, no full in-memory copy) into a temporary
+    # file next to the .ics, which replaces it only once everything succeeded, so a
+    # failure never leaves a truncated calendar behind. With error handling.
+    tmp_file = ics_file + ".tmp"
     try:
         with open(csv_file, mode="r", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row_number, row in enumerate(reader, start=1):
-                try:
-                    event_name = row["Event"]
-                    date_str = row["Date"]      # e.g. "2025-03-03"
-                    start_str = row["StartTime"]  # e.g. "10:00"
-                    end_str = row["EndTime"]      # e.g. "16:00"
-
-                    # Parse date/time to build ICS-friendly strings (UTC not required here,
-                    # but we do need the "YYYYMMDDTHHMMSS" format).
-                    dt_date = datetime.datetime.strptime(date_str, "%Y-%m-%d")
-
-                    # Combine date + start time
-                    start_parts = start_str.split(":")
-                    dt_start = dt_date.replace(hour=int(start_parts[0]), minute=int(start_parts[1]))
-                    dtstart_str = dt_start.strftime("%Y%m%dT%H%M%S")
-
-                    # Combine date + end time
-                    end_parts = end_str.split(":")
-                    dt_end = dt_date.replace(hour=int(end_parts[0]), minute=int(end_parts[1]))
-                    dtend_str = dt_end.strftime("%Y%m%dT%H%M%S")
-
-                    # For UID + DTSTAMP, we can use the current time or the shift start time
-                    uid = dt_start.strftime("%Y%m%dT%H%M%S") + "-" + event_name.replace(" ", "_")
-                    dtstamp = datetime.datetime.now().strftime("%Y%m%dT%H%M%S")
-
-                    # Build each event’s text
-                    vevent = [
-                        "BEGIN:VEVENT",
-                        f"UID:{uid}",
-                        f"DTSTAMP:{dtstamp}",
-                        f"DTSTART:{dtstart_str}",
-                        f"DTEND:{dtend_str}",
-                        f"SUMMARY:{event_name}",
-                        "END:VEVENT",
-                    ]
-                    ics_lines.extend(vevent)
-                except KeyError as e:
-                    print(f"Skipping row {row_number} due to missing column: {e}")
-                except ValueError as e:
-                    print(f"Skipping row {row_number} due to invalid data: {e}")
-    except FileNotFoundError:
-        print(f"ERROR: CSV file not found: {csv_file}")
-        sys.exit(1)
-    except Exception as e:
-        print(f"ERROR: An error occurred while reading the CSV file: {e}")
-        sys.exit(1)
+            # Plain csv.reader with column indices avoids building a dict per row.
+            # The header is checked before any output is written.
+            reader = csv.reader(f)
+            header = next(reader, [])
+            columns = {name: i for i, name in enumerate(header)}
+            try:
+                event_i = columns["Event"]
+                date_i = columns["Date"]
+                start_i = columns["StartTime"]
+                end_i = columns["EndTime"]
+            except KeyError as e:
+                print(f"ERROR: CSV file is missing column: {e}")
+                sys.exit(1)
 
-    ics_lines.append("END:VCALENDAR")
+            with open(tmp_file, mode="w", encoding="utf-8", buffering=1 << 20) as out:
+                out.write(
+                    "BEGIN:VCALENDAR\n"
+                    "VERSION:2.0\n"
+                    "PRODID:-//Chillaid//Bulk ICS Generator//EN\n"
+                )
 
-    # Write everything to the .ics file with error handling
-    try:
-        with open(ics_file, mode="w", encoding="utf-8") as f:
-            for line in ics_lines:
-                f.write(line + "\n")
+                events = []
+                # Blank lines come through as empty rows; skip them like DictReader did
+                rows = (row for row in reader if row)
+                for row_number, row in enumerate(rows, start=1):
+                    try:
+                        event_name = row[event_i]
+                        date_str = row[date_i]      # e.g. "2025-03-03"
+                        start_str = row[start_i]    # e.g. "10:00"
+                        end_str = row[end_i]        # e.g. "16:00"
+
+                        # Parse date/time to build ICS-friendly strings (UTC not required here,
+                        # but we do need the "YYYYMMDDTHHMMSS" format). Splitting by hand is much
+                        # faster than strptime; datetime() still validates the values.
+                        year, month, day = (int(part) for part in date_str.split("-"))
+
+                        # Combine date + start time
+                        start_parts = start_str.split(":")
+                        dt_start = datetime.datetime(year, month, day, int(start_parts[0]), int(start_parts[1]))
+                        dtstart_str = format_ics_datetime(dt_start)
+
+                        # Combine date + end time
+                        end_parts = end_str.split(":")
+                        dt_end = datetime.datetime(year, month, day, int(end_parts[0]), int(end_parts[1]))
+                        dtend_str = format_ics_datetime(dt_end)
+
+                        # For UID we use the shift start time
+                        uid = dtstart_str + "-" + event_name.replace(" ", "_")
+
+                        # Build each event’s text, writing out a batch every EVENTS_PER_WRITE events
+                        events.append(EVENT_TEMPLATE.format(
+                            uid=uid, dtstamp=dtstamp, dtstart=dtstart_str,
+                            dtend=dtend_str, summary=event_name,
+                        ))
+                        if len(events) >= EVENTS_PER_WRITE:
+                            out.write("".join(events))
+                            events.clear()
+                    except IndexError:
+                        print(f"Skipping row {row_number} due to missing columns")
+                    except ValueError as e:
+                        print(f"Skipping row {row_number} due to invalid data: {e}")
+
+                events.append("END:VCALENDAR\n")
+                out.write("".join(events))
+
+        os.replace(tmp_file, ics_file)
+    except FileNotFoundError as e:
+        print(f"ERROR: File not found: {e.filename}")
+        sys.exit(1)
     except Exception as e:
-        print(f"ERROR: An error occurred while writing the ICS file: {e}")
+        print(f"ERROR: An error occurred while generating the ICS file: {e}")
         sys.exit(1)
+    finally:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
 
 def main():
     if len(sys.argv) < 2:
@@ -1,8 +1,35 @@
 #!/usr/bin/env python3
 from PIL import Image
-import sys
+import argparse
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+
+# zlib level for PNG output; --fast trades file size for much quicker saves
+DEFAULT_COMPRESS_LEVEL = 6
+FAST_COMPRESS_LEVEL = 1
+
+def save_size(icns_file, size, target_size, prefix, compress_level=DEFAULT_COMPRESS_LEVEL):
+    with Image.open(icns_file) as im:
+        if im.format == "ICNS":
+            # Pick the embedded image before loading, so PIL decodes only that one
+            # instead of the largest image in the file
+            im.size = size[:2]
+            im.load(scale=size[2])
+        if im.size == target_size:
+            out_img = im
+        else:
+            out_img = im.resize(target_size, Image.LANCZOS)
+        output_filename = f"{prefix}_{target_size[0]}x{target_size[1]}.png"
+        out_img.save(output_filename, format="PNG", optimize=False, compress_level=compress_level)
+    print(f"Exported icon: {output_filename}")
+
+def export_icns_to_png(icns_file, prefix="icon", jobs=None, compress_level=DEFAULT_COMPRESS_LEVEL):
+    if os.path.isdir(icns_file):
+        export_icns_dir_to_png(icns_file, jobs, compress_level)
+        return
 
-def export_icns_to_png(icns_file):
     try:
         im = Image.open(icns_file)
     except Exception as e:
@@ -19,24 +46,53 @@ def export_icns_to_png(icns_file):
         print("No size info found in the ICNS file.")
 
     # Save largest size
-    output_filename = "icon_largest.png"
-    im.save(output_filename, format="PNG")
+    output_filename = f"{prefix}_largest.png"
+    im.save(output_filename, format="PNG", optimize=False, compress_level=compress_level)
     print(f"Exported largest icon: {output_filename}")
 
-    for size in sizes or []:
-        # Make sure size contains only length and width
-        target_size = size if len(size) == 2 else size[:2]
-        if im.size == target_size:
-            continue
-        scaled_img = im.resize(target_size, Image.LANCZOS)
-        output_filename = f"icon_{target_size[0]}x{target_size[1]}.png"
-        scaled_img.save(output_filename, format="PNG")
-        print(f"Exported resized icon: {output_filename}")
+    # Sizes are (width, height, scale); export each embedded image at its pixel size,
+    # skipping duplicates
+    sizes = [size if len(size) == 3 else (*size, 1) for size in sizes or []]
+    targets = {(w * s, h * s): (w, h, s) for w, h, s in sizes}
+    # Point sizes only embedded at a higher scale are resized from that image
+    for w, h, s in sizes:
+        targets.setdefault((w, h), (w, h, s))
+    targets.pop(im.size, None)
+
+    # Decoding and resizing run in PIL's C code without the GIL, so threads are enough here
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as executor:
+        list(executor.map(save_size, repeat(icns_file), targets.values(), targets.keys(),
+                          repeat(prefix), repeat(compress_level)))
+
+def export_icns_dir_to_png(icns_dir, jobs=None, compress_level=DEFAULT_COMPRESS_LEVEL):
+    icns_files = sorted(glob.glob(os.path.join(icns_dir, "*.icns")))
+    if not icns_files:
+        print(f"No .icns files found in {icns_dir}")
+        return
+
+    # Prefix output files with each icon's name so they don't overwrite each other
+    prefixes = [os.path.splitext(os.path.basename(f))[0] for f in icns_files]
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count()) as executor:
+        list(executor.map(export_icns_to_png, icns_files, prefixes, repeat(1),
+                          repeat(compress_level), chunksize=4))
+
+def positive_int(value):
+    """argparse type for --jobs: an integer of at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python export_icns.py <icon_file.icns>")
-        sys.exit(1)
-    
-    icns_path = sys.argv[1]
-    export_icns_to_png(icns_path)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Export all icon sizes from an ICNS file (or a directory of them) to PNG files")
+    parser.add_argument("icns_path", help="ICNS file, or a directory containing .icns files")
+    parser.add_argument("--jobs", type=positive_int, default=None, help="Number of parallel workers (default: number of CPUs)")
+    parser.add_argument("--fast", action="store_true", help="Save PNGs with light compression (faster, larger files)")
+
+    args = parser.parse_args()
+
+    compress_level = FAST_COMPRESS_LEVEL if args.fast else DEFAULT_COMPRESS_LEVEL
+    export_icns_to_png(args.icns_path, jobs=args.jobs, compress_level=compress_level)
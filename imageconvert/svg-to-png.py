@@ -1,17 +1,29 @@
 #!/usr/bin/env python3
+import argparse
+import glob
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
 import cairosvg
 
-def convert_svg_to_png(input_file: str, output_file: str, width: int = None, height: int = None) -> None:
+def convert_svg_to_png(input_file: str, output_file: str, width: int = None, height: int = None,
+                       jobs: int = None) -> None:
     """
     Converts an SVG file to a PNG file.
     
     Parameters:
-    - input_file: Path to the input SVG file.
-    - output_file: Path where the output PNG file will be saved.
+    - input_file: Path to the input SVG file, or a directory of SVG files.
+    - output_file: Path where the output PNG file will be saved, or a directory
+      when input_file is a directory.
     - width: Optional; desired width in pixels for the output PNG.
     - height: Optional; desired height in pixels for the output PNG.
+    - jobs: Optional; number of worker threads for directory input.
     """
+    if os.path.isdir(input_file):
+        convert_svg_dir_to_png(input_file, output_file, width, height, jobs)
+        return
+
     try:
         with open(input_file, "rb") as svg_file:
             cairosvg.svg2png(file_obj=svg_file, write_to=output_file,
@@ -20,21 +32,61 @@ def convert_svg_to_png(input_file: str, output_file: str, width: int = None, hei
     except Exception as e:
         print(f"Error during conversion: {e}")
 
+def convert_svg_dir_to_png(input_dir: str, output_dir: str, width: int = None, height: int = None,
+                           jobs: int = None) -> None:
+    """
+    Converts every SVG file in a directory to a PNG file of the same name in output_dir.
+    Rendering happens in Cairo's C code, which releases the GIL, so a thread pool
+    parallelizes it without the startup cost of worker processes.
+    """
+    svg_files = sorted(glob.glob(os.path.join(input_dir, "*.svg")))
+    if not svg_files:
+        print(f"No .svg files found in {input_dir}")
+        return
+
+    if os.path.exists(output_dir) and not os.path.isdir(output_dir):
+        print(f"Error: output '{output_dir}' exists and is not a directory.")
+        return
+
+    os.makedirs(output_dir, exist_ok=True)
+    png_files = [
+        os.path.join(output_dir, os.path.splitext(os.path.basename(f))[0] + ".png")
+        for f in svg_files
+    ]
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as executor:
+        list(executor.map(convert_svg_to_png, svg_files, png_files,
+                          repeat(width), repeat(height)))
+
+def positive_int(value):
+    """argparse type for --jobs: an integer of at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
 if __name__ == "__main__":
     # Command-line usage:
-    # python svg-to-png.py <input.svg> <output.png> [<width> <height>]
-    if len(sys.argv) not in [3, 5]:
-        print("Usage: python svg-to-png.py <input.svg> <output.png> [<width> <height>]")
-    else:
-        input_svg = sys.argv[1]
-        output_png = sys.argv[2]
-        if len(sys.argv) == 5:
-            try:
-                width = int(sys.argv[3])
-                height = int(sys.argv[4])
-            except ValueError:
-                print("Width and height must be integers.")
-                sys.exit(1)
-            convert_svg_to_png(input_svg, output_png, width, height)
-        else:
-            convert_svg_to_png(input_svg, output_png)
\ No newline at end of file
+    # python svg-to-png.py <input.svg|input_dir> <output.png|output_dir> [<width> <height>] [--jobs N]
+    parser = argparse.ArgumentParser(description="Convert an SVG file (or a directory of them) to PNG")
+    parser.add_argument("input", help="Input SVG file, or a directory containing .svg files")
+    parser.add_argument("output", help="Output PNG file, or a directory for directory input")
+    parser.add_argument("width", nargs="?", help="Optional width in pixels")
+    parser.add_argument("height", nargs="?", help="Optional height in pixels")
+    parser.add_argument("--jobs", type=positive_int, default=None, help="Number of parallel workers (default: number of CPUs)")
+
+    args = parser.parse_args()
+
+    width = height = None
+    if args.width is not None:
+        if args.height is None:
+            parser.error("width and height must be given together")
+        try:
+            width = int(args.width)
+            height = int(args.height)
+        except ValueError:
+            print("Width and height must be integers.")
+            sys.exit(1)
+    convert_svg_to_png(args.input, args.output, width, height, args.jobs)